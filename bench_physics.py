@@ -0,0 +1,48 @@
+# Compare the cost of updating many separate Player objects with
+# updating the same number of entities in a single PhysicsState.
+# The Player keeps its state in plain attributes and does its maths one
+# player at a time, which is the game's original implementation.
+# Usage: python bench_physics.py
+
+import time
+import main
+
+# The numbers of entities to measure.
+COUNTS = [1, 10, 100, 1000, 10000]
+
+# Measure the average frame time of updating and displacing separate players.
+def measurePlayers(count, frames):
+    players = [main.Player(i % 480, 0, 20, 20, (255,193,0), (255,111,0)) for i in range(count)]
+    start = time.perf_counter()
+    for frame in range(frames):
+        for player in players:
+            player.update(1, 0)
+            player.collisionDisplace([0.5, -1.0])
+    return (time.perf_counter() - start) / frames
+
+# Measure the average frame time of updating and displacing
+# the same entities in one PhysicsState.
+def measurePhysicsState(count, frames):
+    physics = main.PhysicsState()
+    for i in range(count):
+        physics.add(i % 480, 0, 20, 20)
+    xSpeeds = [1] * count
+    ySpeeds = [0] * count
+    projectionVectors = [[0.5, -1.0]] * count
+    start = time.perf_counter()
+    for frame in range(frames):
+        physics.update(xSpeeds, ySpeeds)
+        physics.collisionDisplace(projectionVectors)
+    return (time.perf_counter() - start) / frames
+
+def run():
+    for count in COUNTS:
+        # Use fewer frames for more entities to keep the run short.
+        frames = max(20, 20000 // count)
+        players = measurePlayers(count, frames)
+        physics = measurePhysicsState(count, frames)
+        print("{:6d} entities: separate Players {:8.3f} ms/frame, PhysicsState {:8.3f} ms/frame".format(
+            count, players * 1000, physics * 1000))
+
+if __name__ == "__main__":
+    run()
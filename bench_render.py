@@ -0,0 +1,63 @@
+# Measure the frame time of the Dimension Surfer game at several
+# render resolutions. The game is run without a window, on the levels
+# with the most polygons, and every frame is updated, drawn and
+# presented on the 500x500 screen.
+# Usage: python bench_render.py [frames]
+
+import os
+import sys
+import time
+# Run pygame without opening a window.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import main
+
+# The render scales to measure.
+SCALES = [0.5, 1, 2]
+# The levels to measure: 7 has the most level polygons
+# and 2 has the most lava polygons.
+LEVELS = ["7", "2"]
+
+# Measure the average frame time of a level at a given render scale.
+def measure(screen, levelId, renderScale, frames):
+    # Render to the screen directly or to an offscreen surface, like main() does.
+    if renderScale == 1:
+        canvas = screen
+    else:
+        canvas = pygame.Surface(main.scalePoint(screen.get_size(), renderScale)).convert()
+    level = main.Level((33,150,243), (13,71,161), renderScale)
+    lava = main.Lava((255,9,9), (180,0,0), renderScale)
+    stars = main.Stars((255,238,88), (253,216,53), renderScale)
+    player = main.Player(0, 0, 20, 20, (255,193,0), (255,111,0), renderScale)
+    level.set(levelId + "_level")
+    lava.set(levelId + "_lava")
+    stars.set(levelId + "_stars")
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Sweep the mouse over the whole height of the screen,
+        # so that all the cross-sections are drawn.
+        mouse_y = (frame * 7) % 500
+        level.update(mouse_y)
+        lava.update(mouse_y)
+        stars.update(mouse_y, player)
+        canvas.fill((225,245,254))
+        lava.draw(canvas)
+        level.draw(canvas)
+        stars.draw(canvas)
+        player.draw(canvas, level.z)
+        main.present(canvas, screen)
+    return (time.perf_counter() - start) / frames
+
+def run(frames):
+    pygame.init()
+    screen = pygame.display.set_mode((500, 500))
+    for levelId in LEVELS:
+        for renderScale in SCALES:
+            frameTime = measure(screen, levelId, renderScale, frames)
+            print("level {}, scale {}: {:.3f} ms/frame".format(levelId, renderScale, frameTime * 1000))
+    pygame.quit()
+
+if __name__ == "__main__":
+    # The level files are loaded relative to the game's directory.
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
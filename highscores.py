@@ -0,0 +1,115 @@
+# The high score storage library for the Dimension Surfer game.
+# The scores are saved in a background thread, so that the game
+# never has to wait for the disk while drawing a frame.
+
+import os
+import threading
+
+# The number of levels in the game.
+LEVEL_COUNT = 8
+
+# Check whether a list of scores is valid.
+def validate(scores, count):
+    # There has to be one score for every level...
+    if len(scores) != count:
+        return False
+    # ...and every score has to be either -1 (locked) or between 0 and 3 stars.
+    for score in scores:
+        if score < -1 or score > 3:
+            return False
+    return True
+
+# Read and validate the scores from a file.
+# Returns None if the file is missing or its contents are not valid.
+def readScores(path, count):
+    try:
+        with open(path, 'r') as f:
+            scores = [int(x) for x in f.read().split()]
+    except (OSError, ValueError):
+        return None
+    if not validate(scores, count):
+        return None
+    return scores
+
+# Write a file atomically: the data is written to a temporary file first,
+# which is then renamed over the target. A crash during the write leaves
+# the old file untouched.
+def writeAtomic(path, data):
+    tempPath = path + ".tmp"
+    try:
+        with open(tempPath, 'w') as f:
+            f.write(data)
+            # Make sure the data is on the disk before the rename.
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tempPath, path)
+    except OSError:
+        # Do not leave the temporary file behind if the write failed.
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
+
+# A class that loads the scores and saves them in a background thread.
+class ScoreStore():
+    def __init__(self, path, count=LEVEL_COUNT):
+        self.path = path
+        # The last known good copy of the scores.
+        self.backupPath = path + ".bak"
+        self.count = count
+        # The scores waiting to be saved. If save() is called again before
+        # they are written, they are replaced, so only the newest are saved.
+        self.pending = None
+        self.closed = False
+        self.condition = threading.Condition()
+        # Start the thread that writes the scores.
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Load the scores, falling back to the last known good copy
+    # and then to the default scores if the files are missing or damaged.
+    def load(self):
+        scores = readScores(self.path, self.count)
+        if scores is None:
+            scores = readScores(self.backupPath, self.count)
+        if scores is None:
+            # Only the first level is unlocked by default.
+            scores = [0] + [-1] * (self.count - 1)
+        return scores
+
+    # Queue the scores to be saved. This method returns immediately.
+    def save(self, scores):
+        with self.condition:
+            # Copy the list, so that later changes do not affect the saved data.
+            self.pending = list(scores)
+            self.condition.notify()
+
+    # Wait until the pending scores are written and stop the thread.
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    # The background thread's main loop.
+    def run(self):
+        while True:
+            with self.condition:
+                # Wait for scores to save or for the store to be closed.
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                scores = self.pending
+                self.pending = None
+                if scores is None:
+                    # The store was closed and there is nothing left to save.
+                    return
+            data = " ".join([str(x) for x in scores])
+            try:
+                # Save the scores, and then update the last known good copy.
+                writeAtomic(self.path, data)
+                writeAtomic(self.backupPath, data)
+            except OSError:
+                # If the scores cannot be saved, the game carries on
+                # with the scores it has in memory.
+                pass
@@ -1,16 +1,21 @@
 # Import the pygame library.
 import pygame
 import math
+import sys
 # Import the Separating Axis Theorem library
 import sat
+# Import the high score storage library
+import highscores
 
 
 class ThreeDMesh():
-    def __init__(self, baseColour, maxColour):
+    def __init__(self, baseColour, maxColour, renderScale=1):
         self.z = 0
         self.baseColour = baseColour
         self.maxColour = maxColour
         self.currentColour = baseColour
+        # The ratio between the render resolution and the game's coordinates.
+        self.renderScale = renderScale
 
     # Set the object to a given level.
     def set(self, id):
@@ -20,6 +25,13 @@ class ThreeDMesh():
         self.id = id
         # Import the data from a text file.
         self.data = self.importData()
+        # Scale the data to the render resolution once, so that drawing
+        # does not have to do it every frame. The collisions still use
+        # the unscaled self.data.
+        if self.renderScale == 1:
+            self.drawData = self.data
+        else:
+            self.drawData = [[[[c * self.renderScale for c in vertex] for vertex in polygon] for polygon in cSection] for cSection in self.data]
 
     # This method will import polygon data from a text file.
     def importData(self):
@@ -70,7 +82,7 @@ class ThreeDMesh():
     def draw(self, screen):
         # This is a set of polygons in the cross-section that
         # we will be drawing:
-        drawing = self.data[math.floor(self.z)]
+        drawing = self.drawData[math.floor(self.z)]
         # We iterate on the elements of the drawing list,
         # which are lists of vertices...
         for polygon in drawing:
@@ -93,9 +105,121 @@ class ThreeDMesh():
         # Set the currentColour based on self.z.
         self.currentColour = (calculateColour(self.baseColour[0], self.maxColour[0], self.z), calculateColour(self.baseColour[1], self.maxColour[1], self.z), calculateColour(self.baseColour[2], self.maxColour[2], self.z))
 
+# A class that stores the physics state of many players or other
+# moving entities. Every attribute is kept in its own list with one
+# element per entity, so that all the entities can be updated in a single
+# loop instead of calling a method on every one of them. This saves the
+# method call and attribute lookup overhead, but the maths is still done
+# for one entity at a time, so the cost grows linearly with the number
+# of entities. The Player does not use this class, it is meant for
+# other entities that need to be updated in batches.
+class PhysicsState():
+    def __init__(self, xAcceleration=2, yAcceleration=0.2):
+        # The accelerations are shared by all the entities.
+        self.xAcceleration = xAcceleration
+        self.yAcceleration = yAcceleration
+        # Create the per-entity lists.
+        self.x = []
+        self.y = []
+        self.xSpeed = []
+        self.ySpeed = []
+        self.width = []
+        self.height = []
+        self.yPV = []
+        self.vertices = []
+
+    # Add an entity and return its index in the lists.
+    def add(self, x, y, width, height):
+        self.x.append(x)
+        self.y.append(y)
+        self.xSpeed.append(0)
+        self.ySpeed.append(0)
+        self.width.append(width)
+        self.height.append(height)
+        self.yPV.append(0)
+        # The vertices list is created once and then updated in place.
+        self.vertices.append([[x, y], [x + width, y], [x + width, y + height], [x, y + height]])
+        return len(self.x) - 1
+
+    # Update the positions of the entities based on the input given.
+    # The xSpeeds and ySpeeds are lists of the keyboard inputs (-1, 0 or 1)
+    # for the entities starting at the index given by start.
+    def update(self, xSpeeds, ySpeeds, start=0):
+        # Store the lists and constants in local variables,
+        # which are faster to access inside the loop.
+        xs = self.x
+        ys = self.y
+        xSpeed = self.xSpeed
+        ySpeed = self.ySpeed
+        yPV = self.yPV
+        widths = self.width
+        heights = self.height
+        vertices = self.vertices
+        xAcceleration = self.xAcceleration
+        yAcceleration = self.yAcceleration
+        for i in range(start, start + len(xSpeeds)):
+            # Set xSpeed based on left/right keys pressed.
+            xSpeed[i] = xSpeeds[i - start] * xAcceleration
+            # Add a constant to the ySpeed to simulate freefall
+            # and set a speed limit.
+            vy = ySpeed[i] + yAcceleration
+            if vy > 5:
+                vy = 5
+            # Jump if conditions are met.
+            if ySpeeds[i - start] == -1 and yPV[i] < -0.1:
+                vy = -5
+            ySpeed[i] = vy
+            # Reset the stored y component of the projection vector.
+            yPV[i] = 0
+            # Add the speeds to the coordinates.
+            x = xs[i] + xSpeed[i]
+            y = ys[i] + vy
+            # Check if the entity is not slightly out of the screen
+            # on the left side, and displace it back if yes.
+            if x < 0:
+                x = 0
+            xs[i] = x
+            ys[i] = y
+            # Update the coordinates of the rectangle's vertices in place.
+            v = vertices[i]
+            right = x + widths[i]
+            bottom = y + heights[i]
+            v[0][0] = x
+            v[0][1] = y
+            v[1][0] = right
+            v[1][1] = y
+            v[2][0] = right
+            v[2][1] = bottom
+            v[3][0] = x
+            v[3][1] = bottom
+
+    # Displace the entities after collision. The projectionVectors list
+    # holds one vector for every entity starting at the index given by start.
+    def collisionDisplace(self, projectionVectors, start=0):
+        xs = self.x
+        ys = self.y
+        ySpeed = self.ySpeed
+        yPV = self.yPV
+        for i in range(start, start + len(projectionVectors)):
+            pvx, pvy = projectionVectors[i - start]
+            # Change the x and y coordinates according to the projection vector.
+            xs[i] += pvx
+            ys[i] += pvy
+            # Save the y component of the projection vector for use in update()
+            yPV[i] = pvy
+            # Reset the ySpeed after collision
+            if pvy < 0:
+                ySpeed[i] *= abs(pvx) / math.sqrt(pvx ** 2 + pvy ** 2)
+
+    # Reset the position and the ySpeed of the entity with the given index.
+    def reset(self, i):
+        self.x[i] = 0
+        self.y[i] = 0
+        self.ySpeed[i] = 0
+
 # The Player class.
 class Player():
-    def __init__(self, x, y, width, height, baseColour, maxColour):
+    def __init__(self, x, y, width, height, baseColour, maxColour, renderScale=1):
         # Set the attributes to the values given.
         self.x = x
         self.y = y
@@ -108,6 +232,7 @@ class Player():
         self.baseColour = baseColour
         self.maxColour = maxColour
         self.yPV = 0
+        self.renderScale = renderScale
         # Create the vertices list
         self.vertices = []
 
@@ -142,7 +267,9 @@ class Player():
                   calculateColour(self.baseColour[1], self.maxColour[1], levelZ),
                   calculateColour(self.baseColour[2], self.maxColour[2], levelZ))
         # Use pygame's built in draw rectangle function.
-        pygame.draw.rect(screen, colour, [self.x, self.y, self.width, self.height])
+        # The coordinates are scaled to the render resolution.
+        s = self.renderScale
+        pygame.draw.rect(screen, colour, [self.x * s, self.y * s, self.width * s, self.height * s])
 
     # Displace the player after collision.
     def collisionDisplace(self, projectionVector):
@@ -169,14 +296,16 @@ class Lava(ThreeDMesh):
     def collide(self, player, stars):
         # Take the current cross-section from the data array.
         cSection = self.data[math.floor(self.z)]
+        # Read the player's vertices once, outside the loop.
+        vertices = player.vertices
         # Iterate over the polygons in the current cross-section.
         for obstacle in cSection:
             # Check the x and y axes.
-            if not sat.checkOverlap(obstacle, player.vertices, [1,0]):
+            if not sat.checkOverlap(obstacle, vertices, [1,0]):
                 # If there is no overlap we can jump to the next
                 # polygon in the data set thanks to the SAT principles.
                 continue
-            if not sat.checkOverlap(obstacle, player.vertices, [0,1]):
+            if not sat.checkOverlap(obstacle, vertices, [0,1]):
                 continue
             # Iterate over the polygon's edges.
             # We assume that there is overlap unless proven otherwise.
@@ -185,7 +314,7 @@ class Lava(ThreeDMesh):
                 # Get the normal to this edge...
                 normal = sat.getNormal(obstacle[i], obstacle[(i+1) % len(obstacle)])
                 # ...and check for overlap, if the axis is not the x or y axis.
-                if (normal[0]*normal[1] != 0) and not sat.checkOverlap(obstacle, player.vertices, normal):
+                if (normal[0]*normal[1] != 0) and not sat.checkOverlap(obstacle, vertices, normal):
                     # Stop checking the edges and rise the flag that
                     # there is no overlap.
                     collided = 0
@@ -209,6 +338,8 @@ class Level(ThreeDMesh):
         # The final projection vector will be a sum of all the projection
         # vectors from the collided polygons.
         finalVector = [0,0]
+        # Read the player's vertices once, outside the loop.
+        vertices = player.vertices
         # Iterate over the polygons in the current cross-section.
         for obstacle in cSection:
             # Create lists for holding projection vector lengths
@@ -216,7 +347,7 @@ class Level(ThreeDMesh):
             projectionVectorsLenghts = []
             projectionVectors = []
             # Check the x and y axes.
-            vectors = sat.calculateProjectionVectors(obstacle, player.vertices, [1, 0])
+            vectors = sat.calculateProjectionVectors(obstacle, vertices, [1, 0])
             # If the calculateProjectionVectors function did not return false,
             # it means that it successfully found projection vectors...
             if vectors:
@@ -228,7 +359,7 @@ class Level(ThreeDMesh):
             else:
                 continue
 
-            vectors = sat.calculateProjectionVectors(obstacle, player.vertices, [0, 1])
+            vectors = sat.calculateProjectionVectors(obstacle, vertices, [0, 1])
             if vectors:
                 projectionVectorsLenghts.append(vectors[0])
                 projectionVectors.append(vectors[1])
@@ -245,7 +376,7 @@ class Level(ThreeDMesh):
                 normal = sat.getNormal(obstacle[i], obstacle[(i + 1) % len(obstacle)])
                 # ...and check for overlap, if the axis is not the x or y axis.
                 if (normal[0] * normal[1] != 0):
-                    vectors = sat.calculateProjectionVectors(obstacle, player.vertices, normal)
+                    vectors = sat.calculateProjectionVectors(obstacle, vertices, normal)
                     if vectors:
                         projectionVectorsLenghts.append(vectors[0])
                         projectionVectors.append(vectors[1])
@@ -271,12 +402,17 @@ class Level(ThreeDMesh):
 
 # The class that handles all things related to stars
 class Stars():
-    def __init__(self, baseColour, maxColour):
+    def __init__(self, baseColour, maxColour, renderScale=1):
         # Set the attributes
         self.z = 0
         self.baseColour = baseColour
         self.maxColour = maxColour
         self.currentColour = self.baseColour
+        self.renderScale = renderScale
+        # The basic star vertices, scaled to the render resolution.
+        self.vertices = [[v[0] * renderScale, v[1] * renderScale] for v in [[32,10],[20,10],[16,0],[12,10],[0,10],[9,19],[6,30],[16,24],[26,30],[23,19],[32,10]]]
+        # The width of the border of a collected star.
+        self.borderWidth = max(1, round(3 * renderScale))
 
     # Set the object to a given level.
     def set(self, id):
@@ -288,6 +424,11 @@ class Stars():
         self.score = 0
         # Import the data from a text file
         self.data = self.importData()
+        # Scale the positions of the stars and of the star score
+        # to the render resolution once, so that drawing does not have
+        # to do it every frame. The collisions use the unscaled self.data.
+        self.drawData = [[star[0] * self.renderScale, star[1] * self.renderScale] for star in self.data]
+        self.scoreData = [[(5+i*40) * self.renderScale, 5 * self.renderScale] for i in range(len(self.data))]
 
     # Import the data about the stars
     def importData(self):
@@ -308,31 +449,34 @@ class Stars():
         # Return the data array.
         return data
 
-    # Draw a single star.
+    # Draw a single star at the given game coordinates.
     def drawStar(self, screen, x, y, state):
-        # The basic star vertices.
-        vertices = [[32,10],[20,10],[16,0],[12,10],[0,10],[9,19],[6,30],[16,24],[26,30],[23,19],[32,10]]
+        # Scale the given x and y coordinates to the render resolution.
+        self.drawScaledStar(screen, x * self.renderScale, y * self.renderScale, state)
+
+    # Draw a single star at coordinates already scaled to the render resolution.
+    def drawScaledStar(self, screen, x, y, state):
         # Add the given x and y coordinates to the star's vertices.
-        correctedVertices = [[v[0] + x, v[1] + y] for v in vertices]
+        correctedVertices = [[v[0] + x, v[1] + y] for v in self.vertices]
         # Draw the star. The state is used as width. If it is 0 (uncollected),
         # the polygon is filled, if it is 1 (collected),
-        # a border of width 3 is drawn.
-        pygame.draw.polygon(screen, self.currentColour, correctedVertices, state*3)
+        # a border of width 3 (at the default resolution) is drawn.
+        pygame.draw.polygon(screen, self.currentColour, correctedVertices, state*self.borderWidth)
 
     # Draw the stars and the star score.
     def draw(self, screen):
         # Iterate on the stars in the data array.
-        for star in self.data:
-            # Draw the stars.
-            self.drawStar(screen, star[0], star[1], star[2])
+        for i in range(len(self.data)):
+            # Draw the stars at their scaled positions.
+            self.drawScaledStar(screen, self.drawData[i][0], self.drawData[i][1], self.data[i][2])
         # Render the star score.
         for i in range(len(self.data)):
             if i > self.score-1:
                 # Draw an empty star.
-                self.drawStar(screen, 5+i*40, 5, 1)
+                self.drawScaledStar(screen, self.scoreData[i][0], self.scoreData[i][1], 1)
             else:
                 # Draw a full star.
-                self.drawStar(screen, 5+i*40, 5, 0)
+                self.drawScaledStar(screen, self.scoreData[i][0], self.scoreData[i][1], 0)
 
     # Update the stars.
     def update(self, mouse_y, player):
@@ -368,47 +512,140 @@ class Stars():
             # ...setting their state to uncollected.
             star[2] = 0
 
+# A class for playing an animation from a sprite sheet
+# with the frames stacked vertically, starting at the top of the sheet.
+class SpriteAnimation():
+    def __init__(self, path, frameCount, frameSize, frameDuration, renderScale=1):
+        # Set the attributes. The frameSize is the width and height of
+        # a frame on the sheet, and the frameDuration is given in milliseconds.
+        self.path = path
+        self.frameCount = frameCount
+        self.frameSize = frameSize
+        self.frameDuration = frameDuration
+        self.renderScale = renderScale
+        # The frames are only loaded when load() is called
+        # or the animation is first drawn.
+        self.frames = None
+        # The time at which the animation started playing.
+        self.startTime = None
+
+    # Load the sprite sheet and cut it into separate frames,
+    # unless it has already been loaded.
+    def load(self):
+        if self.frames is not None:
+            return
+        sheet = pygame.image.load(self.path).convert()
+        width, height = self.frameSize
+        # Copy every frame into its own surface, scaled to the render
+        # resolution, so that the sheet itself can be freed.
+        self.frames = [scaleImage(sheet.subsurface([0, i*height, width, height]).copy(), self.renderScale)
+                       for i in range(self.frameCount)]
+
+    # Draw the current frame, chosen based on the time elapsed
+    # since the animation was first drawn.
+    def draw(self, screen, position):
+        self.load()
+        now = pygame.time.get_ticks()
+        if self.startTime is None:
+            self.startTime = now
+        frame = int((now - self.startTime) // self.frameDuration) % self.frameCount
+        screen.blit(self.frames[frame], position)
+
+    # Free the frames. They will be loaded again if the animation is drawn.
+    def free(self):
+        self.frames = None
+        self.startTime = None
+
 # A class for displaying the tutorial
 class Tutorial():
-    def __init__(self):
-        # Set the state and current frame to zero.
+    def __init__(self, renderScale=1):
+        # Set the state to zero.
         self.state = 0
-        self.frame = 0
-        # Load the images
-        self.firstImage = pygame.image.load("images/wsad.png").convert()
-        self.secondImage = pygame.image.load("images/animationsheet.jpg").convert()
+        self.renderScale = renderScale
+        # The image is loaded by load() or when it is first drawn.
+        self.firstImage = None
+        # The animation explaining the concept of the third dimension.
+        # It has 24 frames of 500x200, each shown for 8 frames at 60fps.
+        self.animation = SpriteAnimation("images/animationsheet.jpg", 24, (500, 200), 8 * 1000 / 60, renderScale)
+
+    # Load the images that have not been shown yet. This is called when
+    # a level is started, so that loading them does not stall the game.
+    def load(self):
+        if self.state == 0 and self.firstImage is None:
+            self.firstImage = scaleImage(pygame.image.load("images/wsad.png").convert(), self.renderScale)
+        if self.state <= 1:
+            self.animation.load()
 
     # Change to the next state
     def next(self):
         self.state += 1
+        # Free the images that will not be shown anymore.
+        if self.state == 1:
+            self.firstImage = None
+        elif self.state == 2:
+            self.animation.free()
 
     # Draw the image corresponding to the state
     def draw(self, screen):
         if self.state == 0:
+            # Load the image, scaled to the render resolution, if needed.
+            if self.firstImage is None:
+                self.load()
             # Draw the image explaining the use of the WSAD keys
-            screen.blit(self.firstImage, [0,150])
+            screen.blit(self.firstImage, scalePoint([0,150], self.renderScale))
         if self.state == 1:
             # Draw the animation explaining the concept of the third dimension.
-            # Increase the frame counter.
-            self.frame += 1
-            # Calculate the frame to render.
-            renderFrame = (self.frame//8)%24
-            # Cut the animation sheet according to the renderFrame variable
-            # and render it on screen. The third argument are the coordinates
-            # and dimensions of the cut
-            screen.blit(self.secondImage, [0,150], [0, renderFrame*200, 500, 200])
+            self.animation.draw(screen, scalePoint([0,150], self.renderScale))
 
 # Calculate the colour component based on the z position.
 def calculateColour(min, max, z):
     return math.floor(min + z/500 * (max-min))
 
-def main():
+# Scale a list of coordinates (a point or a rectangle) to the render resolution.
+def scalePoint(point, renderScale):
+    return [round(c * renderScale) for c in point]
+
+# Scale an image to the render resolution.
+def scaleImage(image, renderScale):
+    if renderScale == 1:
+        return image
+    return pygame.transform.smoothscale(image, scalePoint(image.get_size(), renderScale))
+
+# Convert a mouse position on the display to the game's coordinates.
+def toGameCoordinates(pos, displayScale):
+    return [int(pos[0] / displayScale), int(pos[1] / displayScale)]
+
+# Show the rendered frame, scaling it to the window if they are different.
+def present(canvas, screen):
+    if canvas is not screen:
+        pygame.transform.scale(canvas, screen.get_size(), screen)
+    pygame.display.flip()
+
+# The renderScale is the ratio between the internal render resolution
+# and the game's 500x500 coordinates. If scaledDisplay is set, the frame
+# is rendered straight to the display and pygame.SCALED scales it to
+# the window, otherwise it is rendered to an offscreen surface
+# which is scaled to the 500x500 window with a single blit.
+def main(renderScale=1, scaledDisplay=False):
     # Initialize the pygame environment.
     pygame.init()
 
     # Set the width and height of the screen.
     size = (500, 500)
-    screen = pygame.display.set_mode(size)
+    # Calculate the internal render resolution.
+    renderSize = scalePoint(size, renderScale)
+    if scaledDisplay:
+        screen = pygame.display.set_mode(renderSize, pygame.SCALED)
+        canvas = screen
+        # The mouse positions are given in the render resolution.
+        displayScale = renderScale
+    else:
+        screen = pygame.display.set_mode(size)
+        if renderScale == 1:
+            canvas = screen
+        else:
+            canvas = pygame.Surface(renderSize).convert()
+        displayScale = 1
 
     # Set the title of the window.
     pygame.display.set_caption("My Game")
@@ -421,20 +658,20 @@ def main():
     clock = pygame.time.Clock()
 
     # Creating objects for testing:
-    level = Level((33,150,243), (13,71,161))
-    lava = Lava((255,9,9), (180,0,0))
-    stars = Stars((255,238,88), (253,216,53))
-    player = Player(0, 0, 20, 20, (255,193,0), (255,111,0))
-    tutorial = Tutorial()
-    s = open("scores.txt", 'r')
-    scores = [int(x) for x in s.read().split(" ")]
-    s.close()
+    level = Level((33,150,243), (13,71,161), renderScale)
+    lava = Lava((255,9,9), (180,0,0), renderScale)
+    stars = Stars((255,238,88), (253,216,53), renderScale)
+    player = Player(0, 0, 20, 20, (255,193,0), (255,111,0), renderScale)
+    tutorial = Tutorial(renderScale)
+    # Load the high scores. They are saved in the background later on.
+    scoreStore = highscores.ScoreStore("scores.txt")
+    scores = scoreStore.load()
     # Load the necessary images.
-    backgroundImage = pygame.image.load("images/main_background.png").convert()
-    lockedImage = pygame.image.load("images/locked.png").convert_alpha()
-    youWinImage = pygame.image.load("images/you_win.png").convert_alpha()
-    newHighScoreImage = pygame.image.load("images/new_high_score.png").convert_alpha()
-    prevHighScoreImage = pygame.image.load("images/prev_high_score.png").convert_alpha()
+    backgroundImage = scaleImage(pygame.image.load("images/main_background.png").convert(), renderScale)
+    lockedImage = scaleImage(pygame.image.load("images/locked.png").convert_alpha(), renderScale)
+    youWinImage = scaleImage(pygame.image.load("images/you_win.png").convert_alpha(), renderScale)
+    newHighScoreImage = scaleImage(pygame.image.load("images/new_high_score.png").convert_alpha(), renderScale)
+    prevHighScoreImage = scaleImage(pygame.image.load("images/prev_high_score.png").convert_alpha(), renderScale)
 
     state = 0
     firstDraw = 1
@@ -444,40 +681,39 @@ def main():
             # Show the winning screen.
             if firstDraw:
                 # Render the background.
-                screen.blit(youWinImage, [0, 0])
+                canvas.blit(youWinImage, [0, 0])
                 # Check if the current high score has been beaten.
                 if stars.score > scores[levelIndex-1]:
                     # If yes, then draw the "New High Score" message.
-                    screen.blit(newHighScoreImage, [281, 267])
+                    canvas.blit(newHighScoreImage, scalePoint([281, 267], renderScale))
                     # Change the stored high score to the current score
                     scores[levelIndex-1] = stars.score
                 else:
                     # If the high score has not been beaten, render the
                     # "Current High Score" message.
-                    screen.blit(prevHighScoreImage, [331, 267])
+                    canvas.blit(prevHighScoreImage, scalePoint([331, 267], renderScale))
                     # Render the current high score using stars
                     # and the algorithm used for that on the main screen.
                     for i in range(3):
                         if i > scores[levelIndex-1] - 1:
-                            stars.drawStar(screen, 350 + i * 33, 330, 1)
+                            stars.drawStar(canvas, 350 + i * 33, 330, 1)
                         else:
-                            stars.drawStar(screen, 350 + i * 33, 330, 0)
+                            stars.drawStar(canvas, 350 + i * 33, 330, 0)
                 # If the next level is not unlocked (and in range), unlock it.
                 if levelIndex < 8 and scores[levelIndex] < 0:
                     scores[levelIndex] = 0
-                # Save the scores to the scores.txt file.
-                s = open("scores.txt", 'w')
-                s.write(" ".join([str(x) for x in scores]))
-                s.close()
+                # Queue the scores to be saved to the scores.txt file.
+                # This does not wait for the file to be written.
+                scoreStore.save(scores)
                 # Render the current score using stars
                 # and the algorithm used for that on the main screen.
                 for i in range(3):
                     if i > stars.score - 1:
-                        stars.drawStar(screen, 54 + i * 33, 330, 1)
+                        stars.drawStar(canvas, 54 + i * 33, 330, 1)
                     else:
-                        stars.drawStar(screen, 54 + i * 33, 330, 0)
+                        stars.drawStar(canvas, 54 + i * 33, 330, 0)
                 # Refresh the screen
-                pygame.display.flip()
+                present(canvas, screen)
                 # Indicate that the screen has been drawn already.
                 firstDraw = 0
             # The event loop must in this case be after the drawing part.
@@ -507,7 +743,7 @@ def main():
                 # may be trying to choose a level.
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     # Get the mouse position.
-                    pos = pygame.mouse.get_pos()
+                    pos = toGameCoordinates(pygame.mouse.get_pos(), displayScale)
                     mouse_x = pos[0]
                     mouse_y = pos[1]
                     # Check whether the cursor is in the level choice area.
@@ -520,6 +756,8 @@ def main():
                             level.set(str(levelIndex) + "_level")
                             lava.set(str(levelIndex) + "_lava")
                             stars.set(str(levelIndex) + "_stars")
+                            # Load the tutorial images, if it is not finished yet.
+                            tutorial.load()
                             # Reset the player's position...
                             player.reset()
                             # ...and all the navigation variables.
@@ -532,7 +770,7 @@ def main():
             # Check if drawing needs to be done.
             if firstDraw:
                 # Draw the background.
-                screen.blit(backgroundImage, [0, 0])
+                canvas.blit(backgroundImage, [0, 0])
                 # Iterate on the list of scores
                 for i in range(len(scores)):
                     # If the level is locked display three empty stars
@@ -540,19 +778,19 @@ def main():
                     if scores[i] < 0:
                         for j in range(3):
                             # We use the drawStar() method od the Stars class.
-                            stars.drawStar(screen, 31 + i%4*113 + j*33, 285 + i//4*113, 1)
-                        screen.blit(lockedImage, [28 + i%4*113, 217 + i//4*113])
+                            stars.drawStar(canvas, 31 + i%4*113 + j*33, 285 + i//4*113, 1)
+                        canvas.blit(lockedImage, scalePoint([28 + i%4*113, 217 + i//4*113], renderScale))
                     # If the level is not locked, display the star score
                     # using a loop almost identical to that used in the draw()
                     # method of the Stars class.
                     else:
                         for j in range(3):
                             if j > scores[i] - 1:
-                                stars.drawStar(screen, 31 + i%4*113 + j*33, 285 + i//4*113, 1)
+                                stars.drawStar(canvas, 31 + i%4*113 + j*33, 285 + i//4*113, 1)
                             else:
-                                stars.drawStar(screen, 31 + i%4*113 + j*33, 285 + i//4*113, 0)
+                                stars.drawStar(canvas, 31 + i%4*113 + j*33, 285 + i//4*113, 0)
                 # Refresh the screen
-                pygame.display.flip()
+                present(canvas, screen)
                 # Indicate that there is no need for further drawing.
                 firstDraw = 0
 
@@ -603,7 +841,7 @@ def main():
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     tutorial.next()
             # Get the mouse coordinates.
-            pos = pygame.mouse.get_pos()
+            pos = toGameCoordinates(pygame.mouse.get_pos(), displayScale)
             mouse_x = pos[0]
             mouse_y = pos[1]
             # print(mouse_x, mouse_y)
@@ -623,18 +861,18 @@ def main():
             # Set the backgorund color
             backgroundBaseColour = (225,245,254)
             backgroundMaxColour = (179,229,252)
-            screen.fill((
+            canvas.fill((
                 calculateColour(backgroundBaseColour[0], backgroundMaxColour[0], level.z),
                 calculateColour(backgroundBaseColour[1], backgroundMaxColour[1], level.z),
                 calculateColour(backgroundBaseColour[2], backgroundMaxColour[2], level.z)))
             # Draw the lava, the level, stars and the player
-            lava.draw(screen)
-            level.draw(screen)
-            stars.draw(screen)
-            player.draw(screen, level.z)
+            lava.draw(canvas)
+            level.draw(canvas)
+            stars.draw(canvas)
+            player.draw(canvas, level.z)
 
             # Display the tutorial.
-            tutorial.draw(screen)
+            tutorial.draw(canvas)
 
             # Change state if player won.
             if player.x >= 500:
@@ -642,7 +880,7 @@ def main():
                 state = -1
 
             # Update the screen:
-            pygame.display.flip()
+            present(canvas, screen)
 
         # Show the frame rate in the title for performance checking.
         pygame.display.set_caption(str(clock.get_fps()))
@@ -651,6 +889,21 @@ def main():
 
     # Close the window when the main loop finishes.
     pygame.quit()
+    # Wait for the scores to be saved.
+    scoreStore.close()
 
 if __name__ == "__main__":
-    main()
+    # The render scale can be given as the first argument, and "scaled"
+    # as the second one, e.g. "python main.py 0.5" or "python main.py 2 scaled".
+    usage = "Usage: python main.py [renderScale [scaled]], where renderScale is a positive number."
+    renderScale = 1
+    if len(sys.argv) > 1:
+        try:
+            renderScale = float(sys.argv[1])
+        except ValueError:
+            sys.exit(usage)
+        # The scale has to be positive and finite, and big enough
+        # for the 500x500 screen to be at least one pixel wide.
+        if not 0 < renderScale < float("inf") or round(500 * renderScale) < 1:
+            sys.exit(usage)
+    main(renderScale, "scaled" in sys.argv[2:])
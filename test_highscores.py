@@ -0,0 +1,105 @@
+# Tests for the high score storage library.
+# Run with: python -m unittest test_highscores
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import highscores
+
+# How long every injected slow write takes, in seconds.
+SLOW_WRITE = 0.5
+
+
+class ScoreStoreTest(unittest.TestCase):
+    def setUp(self):
+        # Work in a temporary directory.
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "scores.txt")
+        with open(self.path, 'w') as f:
+            f.write("0 -1 -1 -1 -1 -1 -1 -1")
+        # Replace writeAtomic with a slow version that records the writes.
+        self.writes = []
+        self.writeStarted = threading.Event()
+        realWriteAtomic = highscores.writeAtomic
+        self.realWriteAtomic = realWriteAtomic
+
+        def slowWriteAtomic(path, data):
+            self.writeStarted.set()
+            time.sleep(SLOW_WRITE)
+            self.writes.append((os.path.basename(path), data))
+            realWriteAtomic(path, data)
+
+        highscores.writeAtomic = slowWriteAtomic
+        self.addCleanup(setattr, highscores, "writeAtomic", realWriteAtomic)
+
+    def write(self, path, data):
+        with open(path, 'w') as f:
+            f.write(data)
+
+    def read(self, path):
+        with open(path, 'r') as f:
+            return f.read()
+
+    def testSaveDoesNotWaitForDisk(self):
+        store = highscores.ScoreStore(self.path)
+        self.addCleanup(store.close)
+        start = time.perf_counter()
+        store.save([1, 0, -1, -1, -1, -1, -1, -1])
+        self.assertLess(time.perf_counter() - start, SLOW_WRITE / 10)
+
+    def testSavesAreCoalesced(self):
+        store = highscores.ScoreStore(self.path)
+        # Queue a first save and wait until the thread is busy writing it.
+        store.save([1, -1, -1, -1, -1, -1, -1, -1])
+        self.assertTrue(self.writeStarted.wait(5))
+        # Queue more saves while the first one is still being written.
+        start = time.perf_counter()
+        for score in range(4):
+            store.save([score, 0, -1, -1, -1, -1, -1, -1])
+        self.assertLess(time.perf_counter() - start, SLOW_WRITE / 10)
+        store.close()
+        # Only the first and the newest scores are written,
+        # each to the scores file and to its backup.
+        self.assertEqual([data for name, data in self.writes if name == "scores.txt"],
+                         ["1 -1 -1 -1 -1 -1 -1 -1", "3 0 -1 -1 -1 -1 -1 -1"])
+
+    def testCloseFlushesPendingSave(self):
+        store = highscores.ScoreStore(self.path)
+        store.save([2, 1, 0, -1, -1, -1, -1, -1])
+        store.close()
+        self.assertEqual(self.read(self.path), "2 1 0 -1 -1 -1 -1 -1")
+        self.assertEqual(self.read(self.path + ".bak"), "2 1 0 -1 -1 -1 -1 -1")
+
+    def testLoadFallsBack(self):
+        self.write(self.path + ".bak", "3 2 0 -1 -1 -1 -1 -1")
+        # A truncated scores file falls back to the backup...
+        self.write(self.path, "3 2 ")
+        store = highscores.ScoreStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.load(), [3, 2, 0, -1, -1, -1, -1, -1])
+        # ...and if the backup is damaged too, to the default scores.
+        self.write(self.path, "garbage")
+        self.write(self.path + ".bak", "4 4 4 4 4 4 4 4")
+        self.assertEqual(store.load(), [0] + [-1] * 7)
+
+    def testFailedWriteRemovesTempFile(self):
+        # Make the fsync fail, as if the disk was full.
+        def failingFsync(fd):
+            raise OSError("disk full")
+        realFsync = highscores.os.fsync
+        highscores.os.fsync = failingFsync
+        self.addCleanup(setattr, highscores.os, "fsync", realFsync)
+        with self.assertRaises(OSError):
+            self.realWriteAtomic(self.path, "1 0 -1 -1 -1 -1 -1 -1")
+        # The old file is untouched and no temporary file is left behind.
+        self.assertEqual(self.read(self.path), "0 -1 -1 -1 -1 -1 -1 -1")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# Tests for the SpriteAnimation class used by the tutorial.
+# Run with: python -m unittest test_sprite_animation
+
+import os
+import unittest
+# Run pygame without opening a window.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import main
+
+SHEET = "images/animationsheet.jpg"
+
+
+class SpriteAnimationTest(unittest.TestCase):
+    def setUp(self):
+        # The images are loaded relative to the game's directory.
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        pygame.init()
+        self.addCleanup(pygame.quit)
+        pygame.display.set_mode((500, 500))
+        self.animation = main.SpriteAnimation(SHEET, 24, (500, 200), 100)
+
+    def testFramesMatchSheetCuts(self):
+        self.animation.load()
+        sheet = pygame.image.load(SHEET).convert()
+        self.assertEqual(len(self.animation.frames), 24)
+        for i in range(24):
+            # Cut the frame out of the sheet the way the tutorial used to.
+            expected = pygame.Surface((500, 200)).convert()
+            expected.blit(sheet, [0, 0], [0, i*200, 500, 200])
+            frame = self.animation.frames[i]
+            self.assertEqual(frame.get_size(), (500, 200))
+            self.assertEqual(pygame.image.tobytes(frame, "RGB"), pygame.image.tobytes(expected, "RGB"))
+
+    def testFrameChosenByElapsedTime(self):
+        screen = pygame.Surface((500, 200)).convert()
+        ticks = [1000]
+        getTicks = pygame.time.get_ticks
+        pygame.time.get_ticks = lambda: ticks[0]
+        self.addCleanup(setattr, pygame.time, "get_ticks", getTicks)
+        # Frame 3 is shown between 300 and 400 ms, and the animation loops.
+        for elapsed, frame in [(0, 0), (350, 3), (2450, 0)]:
+            ticks[0] = 1000 + elapsed
+            self.animation.draw(screen, [0, 0])
+            self.assertEqual(pygame.image.tobytes(screen, "RGB"),
+                             pygame.image.tobytes(self.animation.frames[frame], "RGB"))
+
+
+if __name__ == "__main__":
+    unittest.main()